@@ -1,5 +1,6 @@
 """Entry point for the Calgary MLX scraper"""
 
+import signal
 import sys
 import traceback
 
@@ -72,9 +73,18 @@ def run_specific_areas(scraper: CalgaryMLXScraper) -> None:
             user_input = ''
 
 def main():
+    scraper = None
     try:
         scraper = CalgaryMLXScraper()
 
+        def interrupt(signum, frame):
+            # Wake worker threads sleeping in a retry backoff, otherwise the
+            # thread pools wait for them before the interrupt unwinds
+            scraper.api.cancel()
+            raise KeyboardInterrupt
+
+        signal.signal(signal.SIGINT, interrupt)
+
         if RUN_ALL_AREAS:
             print("Fetching data for all areas.")
             scraper.fetch_all_years()
@@ -88,6 +98,9 @@ def main():
         print(f"\nAn error occurred: {str(e)}")
     except KeyboardInterrupt:
         print(f"\nScraper interrupted")
+    finally:
+        if scraper:
+            scraper.close()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
 import logging
+import random
 import requests
-import sys
-import traceback
+import threading
 
 from typing import List, Dict, Optional, Union
 from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
 
 from .cookie_manager import CookieManager
+from .response_cache import ResponseCache
 from .debug_utils import DebugHelper
 from .config import (
     HOME_URL,
@@ -42,18 +44,26 @@ from .config import (
     GEOCODER_USER_AGENT,
     GEOCODER_MAX_RETRIES,
     GEOCODER_RETRY_DELAY,
+    SEARCH_MAX_RETRIES,
+    SEARCH_MAX_BACKOFF,
+    SEARCH_RETRY_STATUS_CODES,
+    SEARCH_RATE_LIMIT,
+    SEARCH_RATE_BURST,
+    MAX_WORKERS,
+    REQUEST_TIMEOUT,
 )
 from .utils import (
     setup_logging,
     validate_price_range,
     format_property_data,
     repr_dict,
-    random_sleep,
+    loads_json,
     getch,
+    RateLimiter,
 )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Tile:
     """Represents a tile with geographical coordinates."""
 
@@ -138,11 +148,35 @@ class MLXAPI:
         self.logger = logger
         self.debug = debug
         self.cookie_manager = CookieManager()
+        self.response_cache = ResponseCache()
+        self.session = self._create_session()
+        self.rate_limiter = RateLimiter(SEARCH_RATE_LIMIT, SEARCH_RATE_BURST)
+        self.cancelled = threading.Event()
         self.cookies = self._initialize_cookies()
 
+    def _create_session(self) -> requests.Session:
+        """Create the keep-alive session shared by all worker threads"""
+        session = requests.Session()
+
+        # Keep one pooled connection per worker so none are discarded
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=MAX_WORKERS)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    def cancel(self) -> None:
+        """Wake searches sleeping in a retry backoff so they stop promptly"""
+        self.cancelled.set()
+
+    def close(self) -> None:
+        """Close the pooled connections of the session"""
+        self.cancel()
+        self.session.close()
+
     def _initialize_cookies(self) -> Dict[str, str]:
-        # Make a GET request
-        response = requests.get(self.home_url)
+        # Make a GET request, the session keeps the cookies for later requests
+        response = self.session.get(self.home_url, timeout=REQUEST_TIMEOUT)
 
         # Print all cookies
         for cookie in response.cookies:
@@ -163,51 +197,112 @@ class MLXAPI:
             "center_lng": tile.lon,
         }
 
-    def search(
+    def _post_with_retry(self, payload: Dict) -> requests.Response:
+        """POST the search payload, backing off on throttling, server errors,
+        timeouts and dropped connections"""
+        for attempt in range(SEARCH_MAX_RETRIES):
+            if self.cancelled.is_set():
+                raise APIError("Search cancelled")
+
+            last_attempt = attempt == SEARCH_MAX_RETRIES - 1
+            retry_after = ""
+
+            self.rate_limiter.acquire()
+            try:
+                # Only the search sends the AJAX headers, the cookie request
+                # fetches the home page like a plain GET
+                response = self.session.post(
+                    self.search_url,
+                    data=payload,
+                    headers=self.headers,
+                    timeout=REQUEST_TIMEOUT,
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if last_attempt:
+                    raise
+                reason = type(e).__name__
+            else:
+                if (
+                    response.status_code not in SEARCH_RETRY_STATUS_CODES
+                    or last_attempt
+                ):
+                    break
+                reason = f"status {response.status_code}"
+                retry_after = response.headers.get("Retry-After", "")
+
+            # Honor the server's Retry-After hint, otherwise back off exponentially
+            if retry_after.isdigit():
+                backoff = min(SEARCH_MAX_BACKOFF, int(retry_after))
+            else:
+                backoff = min(SEARCH_MAX_BACKOFF, 2**attempt + random.random())
+
+            self.logger.warning(
+                f"Search failed with {reason} on attempt {attempt + 1}. "
+                f"Retrying in {backoff:.1f}s..."
+            )
+            # Sleep on the event so a cancel wakes the backoff early
+            self.cancelled.wait(backoff)
+
+        response.raise_for_status()
+        return response
+
+    def format_omni(self, subarea_code: str, subarea_name: str, area_type: str) -> str:
+        """Format the omni search term identifying a subarea or community"""
+        if area_type == "SUBAREA":
+            template = OMNI_SUBAREA_TEMPLATE
+        elif area_type == "COMMUNITY":
+            template = OMNI_COMMUNITY_TEMPLATE
+        else:
+            raise ValueError(f"Unknown area type: {area_type}")
+
+        return template.format(subarea_code=subarea_code, subarea_name=subarea_name)
+
+    def build_search_payload(
         self,
         subarea_code: str,
         subarea_info: dict,
         year: int,
         dwelling_type: str,
-        tile: Tile = None,
         price_from: int = 0,
         price_to: int = 0,
+        year_to: int = 0,
+    ) -> Dict:
+        """Build the search payload shared by every tile of a query"""
+        omni = subarea_info.get("omni") or self.format_omni(
+            subarea_code, subarea_info["name"], subarea_info["type"]
+        )
+
+        payload = {
+            **DEFAULT_SEARCH_PARAMS,
+            "YEAR_BUILT": f"{year}-{year_to or year}",
+            "PROPERTY_TYPE": f"RESI|DWELLING_TYPE@{dwelling_type}",
+            "DWELLING_TYPE": dwelling_type,
+            "omni": omni,
+        }
+
+        if price_from > 0 and price_to > 0:
+            payload["price-from"] = price_from
+            payload["price-to"] = price_to
+
+        return payload
+
+    def search(
+        self,
+        base_payload: Dict,
+        tile: Tile = None,
         radius: float = 0.02,
     ) -> MLXAPIResponse:
         """Fetch data from the search API"""
         try:
-            payload = DEFAULT_SEARCH_PARAMS.copy()
-
-            year_range = f"{year}-{year}"
-            payload["YEAR_BUILT"] = year_range
-
-            property_type = f"RESI|DWELLING_TYPE@{dwelling_type}"
-            payload["PROPERTY_TYPE"] = property_type
-            payload["DWELLING_TYPE"] = dwelling_type
-
             if tile and tile.id != 0:
-                boundary = self._create_tile_boundary(tile, radius)
-                payload.update(boundary)
-
-            if price_from > 0 and price_to > 0:
-                payload["price-from"] = price_from
-                payload["price-to"] = price_to
-
-            subarea_name = subarea_info["name"]
-
-            area_type = subarea_info["type"]
-            if area_type == "SUBAREA":
-                omni = OMNI_SUBAREA_TEMPLATE.format(
-                    subarea_code=subarea_code, subarea_name=subarea_name
-                )
-            elif area_type == "COMMUNITY":
-                omni = OMNI_COMMUNITY_TEMPLATE.format(
-                    subarea_code=subarea_code, subarea_name=subarea_name
-                )
+                payload = {**base_payload, **self._create_tile_boundary(tile, radius)}
             else:
-                raise ValueError(f"Unknown area type: {area_type}")
+                payload = base_payload
 
-            payload["omni"] = omni
+            # Identical searches are deterministic, reuse a recent response
+            cached = self.response_cache.get(payload)
+            if cached is not None:
+                return MLXAPIResponse(loads_json(cached))
 
             # Debug request information
             self.debug.print_request_info(
@@ -217,27 +312,20 @@ class MLXAPI:
                 payload=payload,
             )
 
-            response = requests.post(
-                self.search_url,
-                headers=self.headers,
-                cookies=self.cookies,
-                data=payload,
-            )
-            response.raise_for_status()
+            response = self._post_with_retry(payload)
+            data = loads_json(response.content)
+            self.response_cache.set(payload, response.content)
 
             # Debug response information
             self.debug.print_response_info(response)
 
-            # Sleep after the request
-            random_sleep()
-
-            return MLXAPIResponse(response.json())
+            return MLXAPIResponse(data)
 
         except Exception as e:
-            traceback.print_exc(file=sys.stdout)
+            location = f"tile at {tile.lat}, {tile.lon}" if tile else "whole area"
             raise APIError(
-                f"Error fetching data for tile at {tile.lat}, {tile.lon}, year {year}: {str(e)}"
-            )
+                f"Error fetching data for {location}, year {base_payload['YEAR_BUILT']}: {str(e)}"
+            ) from e
 
 
 class APIError(Exception):
@@ -1,5 +1,7 @@
 """Configuration settings for the Calgary MLX scraper"""
 
+import os
+
 DEBUG_MODE = False
 
 # API Configuration
@@ -8,8 +10,28 @@ SEARCH_URL = "https://calgarymlx.com/wps/recip/59854/idx.search"
 REFERER = "https://calgarymlx.com/recip.html"
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:133.0) Gecko/20100101 Firefox/133.0'
 
+# Number of tiles fetched concurrently
+MAX_WORKERS = 8
+
+# Number of fetched years buffered for the CSV writer thread
+WRITE_QUEUE_SIZE = 4
+
+# Search retry configuration
+SEARCH_MAX_RETRIES = 5
+SEARCH_MAX_BACKOFF = 60  # seconds
+SEARCH_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Connect and read timeouts for requests to the MLX site
+REQUEST_TIMEOUT = (5, 30)  # seconds
+
+# Search rate limit shared by all worker threads
+SEARCH_RATE_LIMIT = 4.0  # requests per second
+SEARCH_RATE_BURST = 1
+
 START_YEAR = 1950
 END_YEAR = 0
+# Years probed together with one range search so empty stretches are skipped
+YEAR_CHUNK_SIZE = 5
 
 PRICE_FROM = 100000
 PRICE_TO = 2000000
@@ -48,8 +70,14 @@ DATABASE_DIR = "db"
 LOG_DIR = "logs"
 COOKIE_FILE = f"{DATA_DIR}/cookies.json"
 DEFAULT_OUTPUT_FILE = "calgary_properties.csv"
+OUTPUT_FILE_TEMPLATE = "calgary_properties_{area_code}_{property_type}.{output_format}"
+OUTPUT_FORMAT = "csv"  # "csv" or "parquet" (requires pyarrow)
 LOG_FILE = f"{LOG_DIR}/calgary_mlx_scraper.log"
 DEFAULT_DB_FILE = "properties.sqlite3"
+RESPONSE_CACHE_DIR = f"{DATA_DIR}/cache"
+RESPONSE_CACHE_TTL = 86400  # seconds
+# Set MLX_NO_CACHE=1 to ignore cached responses and refetch everything
+RESPONSE_CACHE_REFRESH = bool(os.environ.get("MLX_NO_CACHE"))
 
 # Map Configuration
 MAP_CONFIG = {
@@ -263,4 +291,8 @@ DEFAULT_LONGITUDE = -114.0719
 # Geocoding Configuration
 GEOCODER_USER_AGENT = USER_AGENT
 GEOCODER_MAX_RETRIES = 3
-GEOCODER_RETRY_DELAY = 1  # seconds
+GEOCODER_RETRY_DELAY = 1  # seconds, first retry delay
+GEOCODER_MAX_BACKOFF = 30  # seconds
+GEOCODER_TIMEOUT = 10  # seconds
+GEOCODER_MAX_WORKERS = 4
+GEOCODER_RATE_LIMIT = 1.0  # requests per second, per Nominatim usage policy
@@ -1,12 +1,20 @@
 import sqlite3
 from sqlite3 import Error
-from typing import Optional
+from typing import Dict, Iterable, List
 
 
 def create_connection(db_file: str) -> sqlite3.Connection:
     """Create a database connection"""
     try:
         conn = sqlite3.connect(db_file)
+
+        # Write-ahead logging with normal sync needs one fsync per checkpoint
+        # instead of two per commit, which suits the per-query saves
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        conn.execute("PRAGMA busy_timeout=5000")  # milliseconds
         return conn
     except Error as e:
         print(f"Error connecting to database: {e}")
@@ -38,25 +46,24 @@ def create_area_coordinates_table(conn: sqlite3.Connection) -> None:
         raise
 
 
-def get_area_coordinates(
-    conn: sqlite3.Connection, area_name: str, city: str, province: str, country: str
-) -> Optional[tuple]:
-    """Get coordinates for an area from the database"""
+def get_all_area_coordinates(
+    conn: sqlite3.Connection, city: str, province: str, country: str
+) -> Dict[str, tuple]:
+    """Get the coordinates of every saved area in a city, keyed by area name"""
     try:
         cursor = conn.cursor()
         cursor.execute(
             """
-            SELECT latitude, longitude 
-            FROM area_coordinates 
-            WHERE area_name = ? AND city = ? AND province = ? AND country = ?
+            SELECT area_name, latitude, longitude
+            FROM area_coordinates
+            WHERE city = ? AND province = ? AND country = ?
         """,
-            (area_name, city, province, country),
+            (city, province, country),
         )
-        result = cursor.fetchone()
-        return result if result else None
+        return {name: (lat, lon) for name, lat, lon in cursor.fetchall()}
     except Error as e:
         print(f"Error retrieving coordinates: {e}")
-        return None
+        return {}
 
 
 def save_area_coordinates(
@@ -90,6 +97,26 @@ def save_area_coordinates(
         raise
 
 
+def insert_properties(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: List[str],
+    rows: Iterable[tuple],
+) -> int:
+    """Insert property rows in one transaction, skipping ids already stored"""
+    try:
+        sql = f"""
+        INSERT OR IGNORE INTO {table_name} ({", ".join(columns)})
+        VALUES ({", ".join("?" * len(columns))})
+        """
+        with conn:
+            cursor = conn.executemany(sql, rows)
+        return cursor.rowcount
+    except Error as e:
+        print(f"Error inserting properties: {e}")
+        raise
+
+
 def create_property_table(conn: sqlite3.Connection, table_name: str) -> None:
     """Create a table for storing property data."""
     try:
@@ -140,7 +167,8 @@ def update_price_differences(conn, table_name):
         UPDATE {table_name}
         SET price_difference = sold_price - list_price,
             percent_difference = ROUND(((sold_price - list_price) / list_price) * 100, 2)
-        WHERE list_price != 0;  -- Avoid division by zero
+        WHERE list_price != 0  -- Avoid division by zero
+          AND price_difference IS NULL;  -- Stored rows are never updated
         """
 
         cursor.execute(update_query)
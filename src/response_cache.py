@@ -0,0 +1,62 @@
+"""On-disk cache of search responses for the scraper"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Optional
+from .config import RESPONSE_CACHE_DIR, RESPONSE_CACHE_TTL, RESPONSE_CACHE_REFRESH
+from .utils import dumps_json_key
+
+class ResponseCache:
+    def __init__(
+        self,
+        cache_dir: str = RESPONSE_CACHE_DIR,
+        ttl: int = RESPONSE_CACHE_TTL,
+        refresh: bool = RESPONSE_CACHE_REFRESH,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.refresh = refresh
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._prune()
+
+    def _prune(self) -> None:
+        """Delete entries older than the TTL so the cache cannot grow unbounded"""
+        expired = time.time() - self.ttl
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < expired:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def _pathname(self, payload: Dict) -> str:
+        """Return the cache file path for a request payload"""
+        key = hashlib.blake2b(dumps_json_key(payload), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, payload: Dict) -> Optional[bytes]:
+        """Return the cached response body if it exists and is recent"""
+        if self.refresh:
+            return None
+
+        pathname = self._pathname(payload)
+        try:
+            if time.time() - os.path.getmtime(pathname) < self.ttl:
+                with open(pathname, 'rb') as f:
+                    return f.read()
+            os.remove(pathname)
+        except OSError:
+            pass
+
+        return None
+
+    def set(self, payload: Dict, content: bytes) -> None:
+        """Store a response body, replacing the file atomically"""
+        pathname = self._pathname(payload)
+        temp_pathname = f"{pathname}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_pathname, 'wb') as f:
+            f.write(content)
+        os.replace(temp_pathname, pathname)
@@ -1,14 +1,20 @@
 """Main scraper implementation for Calgary MLX"""
 
 import requests
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import os
+import queue
+import random
+import threading
+from collections import deque
 from datetime import datetime
-import sys
-import traceback
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from string import Formatter
 
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
@@ -22,6 +28,8 @@ from .config import (
     DATA_DIR,
     DATABASE_DIR,
     DEFAULT_OUTPUT_FILE,
+    OUTPUT_FILE_TEMPLATE,
+    OUTPUT_FORMAT,
     LOG_FILE,
     DEFAULT_DB_FILE,
     COOKIES,
@@ -30,8 +38,10 @@ from .config import (
     DEBUG_MODE,
     PRICE_FROM,
     PRICE_TO,
-    PRICE_STEP,
     MIN_PRICE_STEP,
+    MAX_WORKERS,
+    WRITE_QUEUE_SIZE,
+    YEAR_CHUNK_SIZE,
     OMNI_SUBAREA_TEMPLATE,
     OMNI_COMMUNITY_TEMPLATE,
     LISTING_URL_PREFIX,
@@ -49,14 +59,18 @@ from .config import (
     GEOCODER_USER_AGENT,
     GEOCODER_MAX_RETRIES,
     GEOCODER_RETRY_DELAY,
+    GEOCODER_MAX_BACKOFF,
+    GEOCODER_TIMEOUT,
+    GEOCODER_MAX_WORKERS,
+    GEOCODER_RATE_LIMIT,
 )
 from .utils import (
     setup_logging,
     validate_price_range,
     format_property_data,
     repr_dict,
-    random_sleep,
     getch,
+    RateLimiter,
 )
 from .debug_utils import DebugHelper
 from .database import (
@@ -64,12 +78,61 @@ from .database import (
     create_property_table,
     update_price_differences,
     create_area_coordinates_table,
-    get_area_coordinates,
+    get_all_area_coordinates,
     save_area_coordinates,
+    insert_properties,
 )
 
 from .api import Tile, MLXAPI, MLXAPIResponse, APIError
 
+# Street fields joined into the listing URL, looked up once
+STREET_PART_FIELDS = tuple(PROPERTY_URL_FIELDS["street_parts"])
+
+# Lowercases Latin letters and turns spaces into dashes in a single pass
+SLUG_TABLE = str.maketrans(
+    {
+        **{chr(c): chr(c).lower() for c in range(0x250) if chr(c).lower() != chr(c)},
+        " ": "-",
+    }
+)
+
+# Listing fields converted to float64 when the DataFrame is built
+NUMERIC_FIELDS = (
+    "PRICE_RAW",
+    "SOLD_PRICE_RAW",
+    "AREA_SQ_FEET",
+    "TOTAL_BEDROOMS",
+    "TOTAL_BATHS",
+    "LATITUDE",
+    "LONGITUDE",
+)
+
+# Listing fields kept in the DataFrame, mapped to their column names
+COLUMN_MAPPING = {
+    "LIST_ID": "id",
+    "STREET_NUMBER": "street_number",
+    "STREET_NAME": "street_name",
+    "STREET_DIR": "street_direction",
+    "STREET_TYPE": "street_type",
+    "CITY": "city",
+    "POSTAL_CODE": "postal_code",
+    "PRICE_RAW": "list_price",
+    "SOLD_PRICE_RAW": "sold_price",
+    "LISTED_DATE": "list_date",
+    "SOLD_DATE": "sold_date",
+    "AREA_SQ_FEET": "square_feet",
+    "MLS_NUM": "mls_number",
+    "TOTAL_BEDROOMS": "bedrooms",
+    "TOTAL_BATHS": "bathrooms",
+    "LATITUDE": "latitude",
+    "LONGITUDE": "longitude",
+    "AGENT_NAME": "agent",
+    "OFFICE_NAME": "office",
+    "LIST_SUBAREA": "neighborhood",
+    "url": "detail_url",
+    "year": "built_year",
+}
+
 
 class CalgaryMLXScraper:
     def __init__(self):
@@ -77,11 +140,26 @@ class CalgaryMLXScraper:
         self.start_year = START_YEAR
         self.end_year = END_YEAR if END_YEAR > 0 else datetime.now().year
         self.debug = DebugHelper(DEBUG_MODE)
-        self.geolocator = Nominatim(user_agent=GEOCODER_USER_AGENT)
+        self.geolocator = Nominatim(
+            user_agent=GEOCODER_USER_AGENT, timeout=GEOCODER_TIMEOUT
+        )
+        self.geocoder_rate_limiter = RateLimiter(GEOCODER_RATE_LIMIT)
         self.api = MLXAPI(self.logger, self.debug)
 
+        # Create the output directory once rather than before every save
+        os.makedirs(DATA_DIR, exist_ok=True)
+
+        # Parquet output needs pyarrow, fail before any location is buffered
+        if OUTPUT_FORMAT == "parquet":
+            import pyarrow  # noqa: F401
+
         self._init_db()
 
+    def close(self) -> None:
+        """Release the HTTP session and the database connection"""
+        self.api.close()
+        self.conn.close()
+
     def _init_db(self, db_file: str = DEFAULT_DB_FILE):
         """Save the processed data to a CSV file"""
         try:
@@ -109,8 +187,13 @@ class CalgaryMLXScraper:
         property_type: dict,
         price_from: int = 0,
         price_to: int = 0,
+        seen_ids: Optional[set] = None,
     ) -> dict:
-        """Fetch all properties for a specific year and refine the process"""
+        """Fetch all properties for a specific year and refine the process
+
+        Listings whose ids are already in seen_ids (shared by every query of
+        the same year) are counted but not parsed or saved again.
+        """
         result = {"count": 0, "df": pd.DataFrame(), "found_all": True}
 
         try:
@@ -120,65 +203,130 @@ class CalgaryMLXScraper:
                 Tile(subarea_info["latitude"], subarea_info["longitude"], 0, 1, 0),
             ]
 
-            # Initialize flags and counters
-            is_first = True
-            total_found = 0
-            all_df = pd.DataFrame()
+            # Initialize counters
             new_tiles_count = 0
+            empty_tiles_count = 0
             dwelling_type = property_type["type"]
 
-            # Iterate through tiles to fetch properties
-            for i, tile in enumerate(tiles):
-                self.logger.debug(
-                    f"Processing tile {i}: {tile.id}, {tile.count}, {price_from}-{price_to}"
-                )
-                response = self.api.search(
-                    subarea_code,
-                    subarea_info,
-                    year,
-                    dwelling_type,
-                    tile,
-                    price_from,
-                    price_to,
-                )
+            # The payload is identical for every tile apart from its boundary
+            payload = self.api.build_search_payload(
+                subarea_code,
+                subarea_info,
+                year,
+                dwelling_type,
+                price_from,
+                price_to,
+            )
+            search = partial(self.api.search, payload)
 
-                # Process the first response to get total_found
-                if is_first:
-                    total_found = response.total_found
-                    is_first = False
+            # The first tile covers the whole area and reports total_found
+            self.logger.debug(
+                f"Processing tile 0: {tiles[0].id}, {tiles[0].count}, "
+                f"{price_from}-{price_to}"
+            )
+            response = search(tiles[0])
+            total_found = response.total_found
 
-                    self.logger.debug(
-                        f"Year {year} and Price {price_from}-{price_to}: Found {total_found} properties"
-                    )
+            self.logger.debug(
+                f"Year {year} and Price {price_from}-{price_to}: "
+                f"Found {total_found} properties"
+            )
 
-                    if total_found == 0:
-                        return result
+            if total_found == 0:
+                return result
 
-                # Parse and concatenate property data
-                df = self.parse_property_data(year, response)
-                all_df = pd.concat([all_df, df], ignore_index=True)
-                all_df = all_df.drop_duplicates(subset=["id"])
+            if seen_ids is None:
+                seen_ids = set()
 
-                # Check if all properties have been retrieved
-                total_retrived = len(all_df)
-                if total_retrived >= total_found:
-                    break
+            all_listings = []
+            query_ids = set()
+            responses = [response]
+            pending = tiles[1:]
 
-                # Add new tiles to the list if not already present
-                for new_tile in response.tiles:
-                    if new_tile not in tiles:
-                        tiles.append(new_tile)
-                        new_tiles_count += 1
-                        self.logger.debug(
-                            f"Added new tile {new_tile.id}: {new_tile.count}"
+            # Tiles hash by id, so membership checks stay O(1) as tiles grow
+            known_tiles = set(tiles)
+
+            # Fetch the remaining tiles in parallel, submitting the new tiles
+            # each response reveals as soon as that response arrives. Debug
+            # mode prints every request and waits for a key press, so its
+            # searches run one at a time
+            workers = 1 if self.debug.debug_mode else MAX_WORKERS
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                in_flight = set()
+                try:
+                    while True:
+                        for response in responses:
+                            # Accumulate unseen raw listings, the DataFrame
+                            # is built once
+                            for prop in response.listings:
+                                list_id = prop.get("LIST_ID")
+                                if list_id in query_ids:
+                                    continue
+                                query_ids.add(list_id)
+                                if list_id not in seen_ids:
+                                    all_listings.append(prop)
+
+                            # Add new tiles to the list if not already present
+                            for new_tile in response.tiles:
+                                if new_tile not in known_tiles:
+                                    known_tiles.add(new_tile)
+
+                                    # A tile reporting no listings can only
+                                    # return an empty response, so skip it
+                                    if new_tile.count == 0:
+                                        empty_tiles_count += 1
+                                        continue
+
+                                    pending.append(new_tile)
+                                    new_tiles_count += 1
+                                    self.logger.debug(
+                                        f"Added new tile {new_tile.id}: "
+                                        f"{new_tile.count}"
+                                    )
+
+                        # Check if all properties have been retrieved
+                        total_retrived = len(query_ids)
+                        if total_retrived >= total_found:
+                            break
+
+                        if pending:
+                            self.logger.debug(
+                                f"Processing {len(pending)} tiles, "
+                                f"{price_from}-{price_to}"
+                            )
+                            # Dispatch the busiest tiles first to shorten the tail
+                            pending.sort(key=lambda t: t.count, reverse=True)
+                            in_flight.update(
+                                executor.submit(search, t) for t in pending
+                            )
+                            pending = []
+
+                        if not in_flight:
+                            break
+
+                        done, in_flight = wait(
+                            in_flight, return_when=FIRST_COMPLETED
                         )
+                        responses = [future.result() for future in done]
+                finally:
+                    # Drop queued tiles that are no longer needed, also when a
+                    # tile search failed, so the pool does not send them
+                    for future in in_flight:
+                        future.cancel()
+
+            all_df = self._finalize_dataframe(year, all_listings)
 
             # Log new tiles count
             if new_tiles_count > 0:
                 self.logger.debug(f"Year {year}: Added {new_tiles_count} new tiles")
 
+            if empty_tiles_count > 0:
+                self.logger.debug(
+                    f"Year {year}: Skipped {empty_tiles_count} tiles without listings"
+                )
+
             # Log processed tiles count
-            self.logger.debug(f"Year {year}: Processed {len(tiles)} tiles")
+            self.logger.debug(f"Year {year}: Processed {len(known_tiles)} tiles")
 
             # Check if all expected properties were retrieved
             if total_retrived != total_found:
@@ -206,15 +354,23 @@ class CalgaryMLXScraper:
             table_name = property_type["name"]
             self.save_to_database(table_name, all_df)
 
-            result["count"] = len(all_df)
+            # Only mark the ids as seen once their rows are saved and returned,
+            # a failed query leaves them for the price range queries
+            seen_ids.update(query_ids)
+
+            result["count"] = total_retrived
             result["df"] = all_df
             result["found_all"] = total_retrived == total_found
 
             return result
 
         except Exception as e:
-            self.logger.error(f"Error processing year {year}: {str(e)}")
-            traceback.print_exc(file=sys.stdout)
+            self.logger.error(f"Error processing year {year}: {str(e)}", exc_info=True)
+            # The console only shows INFO and WARNING records
+            self.logger.warning(
+                f"Year {year}: Search failed, properties may be missing"
+            )
+            result["found_all"] = False
             return result
 
     def fetch_properties_by_prices(
@@ -224,58 +380,59 @@ class CalgaryMLXScraper:
         year: int,
         property_name: str,
         property_type: dict,
-        count: int,
         price_from: int = PRICE_FROM,
         price_to: int = PRICE_TO,
-        price_step: int = PRICE_STEP,
+        seen_ids: Optional[set] = None,
     ) -> dict:
 
-        result = {"count": 0, "df": pd.DataFrame(), "found_all": True}
-
-        if price_step < MIN_PRICE_STEP:
-            self.logger.warning(
-                f"Price step {price_step} is less than minimal {MIN_PRICE_STEP}"
-            )
-            return result
-
-        all_df = pd.DataFrame()
-        for price in range(price_from, price_to, price_step):
-            result = self.fetch_properties(
-                subarea_code,
-                subarea_info,
-                year,
-                property_name,
-                property_type,
-                price_from=price,
-                price_to=price + price_step,
-            )
-
-            if result["count"] == 0:
+        result = {"count": 0, "df": pd.DataFrame()}
+
+        # Every price range shares the seen ids, so the frames never overlap
+        # and can be concatenated once without dropping duplicates
+        if seen_ids is None:
+            seen_ids = set()
+
+        # Split the price range in halves, and only split again the halves
+        # still missing properties, so sparse ranges cost few searches
+        frames = []
+        ranges = deque([(price_from, price_to)])
+        while ranges:
+            range_from, range_to = ranges.popleft()
+            half = (range_to - range_from) // 2 // MIN_PRICE_STEP * MIN_PRICE_STEP
+            if half < MIN_PRICE_STEP:
+                self.logger.warning(
+                    f"Price range {range_from}-{range_to} cannot be split below {MIN_PRICE_STEP}"
+                )
                 continue
 
-            all_df = pd.concat([all_df, result["df"]], ignore_index=True)
-
-            if not result["found_all"]:
-                result = self.fetch_properties_by_prices(
+            middle = range_from + half
+            for low, high in ((range_from, middle), (middle, range_to)):
+                price_result = self.fetch_properties(
                     subarea_code,
                     subarea_info,
                     year,
                     property_name,
                     property_type,
-                    count,
-                    price,
-                    price + price_step,
-                    int(price_step / 10),
+                    price_from=low,
+                    price_to=high,
+                    seen_ids=seen_ids,
                 )
 
-                if result["count"] > 0:
-                    all_df = pd.concat([all_df, result["df"]], ignore_index=True)
+                if price_result["count"] == 0:
+                    continue
 
-        all_df = all_df.drop_duplicates(subset=["id"])
+                frames.append(price_result["df"])
 
-        result["count"] = len(all_df)
+                if not price_result["found_all"]:
+                    ranges.append((low, high))
+
+        frames = [df for df in frames if not df.empty]
+        all_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+        # The frames only hold listings earlier queries missed, so report the
+        # unique ids retrieved across every query of the year
+        result["count"] = len(seen_ids)
         result["df"] = all_df
-        result["found_all"] = len(all_df) == count
 
         if price_from == PRICE_FROM and price_to == PRICE_TO:
             self.logger.info(f"Year {year}: Found {result['count']} properties")
@@ -296,15 +453,24 @@ class CalgaryMLXScraper:
     ) -> pd.DataFrame:
             
         self.logger.debug(f"Starting processing for year {year}")
+
+        # Listings already parsed by one query of this year are skipped by
+        # the price range queries that return them again
+        seen_ids = set()
         result = self.fetch_properties(
-            subarea_code, subarea_info, year, property_name, property_type
+            subarea_code,
+            subarea_info,
+            year,
+            property_name,
+            property_type,
+            seen_ids=seen_ids,
         )
 
         if result["found_all"] and result["count"] == 0:
             self.logger.debug(f"No properties found for year {year}")
             return None
 
-        df = pd.DataFrame()
+        frames = []
         if not result["found_all"]:
             new_result = self.fetch_properties_by_prices(
                 subarea_code,
@@ -312,15 +478,14 @@ class CalgaryMLXScraper:
                 year,
                 property_name,
                 property_type,
-                count=result["count"],
+                seen_ids=seen_ids,
             )
+            frames.append(new_result["df"])
 
-            new_df = new_result["df"]
-            df = pd.concat([df, new_df], ignore_index=True)
-
-        df = pd.concat([df, result["df"]], ignore_index=True)
+        frames.append(result["df"])
+        frames = [df for df in frames if not df.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
         if not df.empty:
-            df = df.drop_duplicates(subset=["id"])
             self.logger.info(f"Year {year}: retrieved {len(df)} properties")
 
         return df
@@ -358,39 +523,129 @@ class CalgaryMLXScraper:
         property_type: type,
     ):
         subarea_name = subarea_info["name"]
+        filename = OUTPUT_FILE_TEMPLATE.format(
+            area_code=subarea_code,
+            property_type=property_type["name"],
+            output_format=OUTPUT_FORMAT,
+        )
 
-        all_df = pd.DataFrame()
+        seen_ids = set()
 
         self.logger.info(f"Processing subarea: {subarea_name} ({subarea_code})")
 
-        for year in range(self.start_year, self.end_year + 1):
-            df = self.fetch_properties_by_year(subarea_code, subarea_info, year,
-                                               property_name, property_type)
-            all_df = pd.concat([all_df, df], ignore_index=True)
+        # Hand each year's rows to a writer thread so the output is written
+        # while the next year is being fetched
+        write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        write_errors = []
+        writer = threading.Thread(
+            target=self._write_output_from_queue,
+            args=(write_queue, filename, write_errors),
+        )
+        writer.start()
 
-        if all_df.size > 0:
-            final_df = all_df.drop_duplicates(subset=["id"])
-            self.logger.info(f"{subarea_name}: Found {len(final_df)} unique properties")
+        try:
+            for year in self._years_to_fetch(subarea_code, subarea_info, property_type):
+                df = self.fetch_properties_by_year(subarea_code, subarea_info, year,
+                                                   property_name, property_type)
+                if df is None or df.empty:
+                    continue
+
+                # Only the ids are kept in memory, the rows go straight to the writer
+                df = df[~df["id"].isin(seen_ids)]
+                seen_ids.update(df["id"])
+                if not df.empty:
+                    write_queue.put(df)
+        finally:
+            write_queue.put(None)
+            writer.join()
+
+        # The console only shows INFO and WARNING records
+        if write_errors:
+            self.logger.warning(
+                f"{subarea_name}: Could not write {filename}, the output is "
+                f"incomplete: {str(write_errors[0])}"
+            )
+
+        if seen_ids:
+            self.logger.info(f"{subarea_name}: Found {len(seen_ids)} unique properties")
         else:
             self.logger.warning(f"No properties found for {subarea_name}")
 
+    def _years_to_fetch(
+        self, subarea_code: str, subarea_info: dict, property_type: dict
+    ) -> Iterable[int]:
+        """Yield the years worth fetching, skipping chunks of years without properties"""
+        for chunk_start in range(self.start_year, self.end_year + 1, YEAR_CHUNK_SIZE):
+            chunk_end = min(chunk_start + YEAR_CHUNK_SIZE - 1, self.end_year)
+
+            # Listings carry no built year of their own, so properties are still
+            # fetched year by year; a single range search only rules out empty chunks
+            if chunk_end > chunk_start:
+                try:
+                    payload = self.api.build_search_payload(
+                        subarea_code,
+                        subarea_info,
+                        chunk_start,
+                        property_type["type"],
+                        year_to=chunk_end,
+                    )
+                    if self.api.search(payload).total_found == 0:
+                        self.logger.debug(
+                            f"No properties found for years {chunk_start}-{chunk_end}"
+                        )
+                        continue
+                except APIError as e:
+                    self.logger.warning(
+                        f"Could not count years {chunk_start}-{chunk_end}: {str(e)}"
+                    )
+
+            yield from range(chunk_start, chunk_end + 1)
+
+    def _write_output_from_queue(
+        self, write_queue: queue.Queue, filename: str, errors: list
+    ) -> None:
+        """Write queued DataFrames to the output file until a None sentinel arrives
+
+        A write failure is appended to errors for the producer to report.
+        """
+        finished = False
+
+        def queued_frames():
+            nonlocal finished
+            while (df := write_queue.get()) is not None:
+                yield df
+            finished = True
+
+        try:
+            if OUTPUT_FORMAT == "parquet":
+                frames = list(queued_frames())
+                if frames:
+                    self.save_to_parquet(pd.concat(frames, ignore_index=True), filename)
+            else:
+                # Open the subarea CSV once and append every year's rows to it
+                self.save_frames_to_csv(queued_frames(), filename)
+        except Exception as e:
+            errors.append(e)
+
+            # Keep draining so the producer never blocks on a full queue
+            if not finished:
+                for _ in queued_frames():
+                    pass
+
     def _add_avg_ft_price(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add average price per square foot column"""
         try:
-            # Convert price and square_feet to numeric, handling any non-numeric values
-            df["sold_price"] = pd.to_numeric(df["sold_price"], errors="coerce")
-            df["square_feet"] = pd.to_numeric(df["square_feet"], errors="coerce")
-
             # Calculate price per square foot
             # Only calculate where both price and square feet are valid numbers and greater than 0
-            mask = (df["sold_price"] > 0) & (df["square_feet"] > 0)
-            df["avg_ft_price"] = 0.0  # Initialize column
-            df.loc[mask, "avg_ft_price"] = (
-                df.loc[mask, "sold_price"] / df.loc[mask, "square_feet"]
-            )
+            sold_price = df["sold_price"].to_numpy(dtype=np.float64)
+            square_feet = df["square_feet"].to_numpy(dtype=np.float64)
+            mask = (sold_price > 0) & (square_feet > 0)
+
+            avg_ft_price = np.zeros(len(df))
+            np.divide(sold_price, square_feet, out=avg_ft_price, where=mask)
 
             # Format to 2 decimal places
-            df["avg_ft_price"] = df["avg_ft_price"].round(2)
+            df["avg_ft_price"] = np.round(avg_ft_price, 2, out=avg_ft_price)
 
             return df
         except Exception as e:
@@ -401,51 +656,72 @@ class CalgaryMLXScraper:
 
     def parse_property_data(self, year: int, response: MLXAPIResponse) -> pd.DataFrame:
         """Parse the response data into a structured format, handling both response types"""
+        return self._finalize_dataframe(year, response.listings)
+
+    def _downcast_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink integer and low-cardinality text columns before saving"""
+        # Coordinates and prices per square foot stay float64, as float32
+        # would leak rounding noise into the database and CSV values
+        for column in (
+            "list_price",
+            "sold_price",
+            "list_date",
+            "sold_date",
+            "square_feet",
+            "bedrooms",
+            "bathrooms",
+            "built_year",
+        ):
+            try:
+                # Nullable integers keep a missing value from turning the
+                # column into floats, so every year formats whole numbers alike
+                df[column] = pd.to_numeric(
+                    df[column].astype("Int64"), downcast="integer"
+                )
+            except (ValueError, TypeError):
+                pass  # Leave non-numeric or fractional columns untouched
+
+        for column in (
+            "street_direction",
+            "street_type",
+            "city",
+            "neighborhood",
+            "agent",
+            "office",
+        ):
+            df[column] = df[column].astype("category")
+
+        return df
+
+    def _convert_numeric_fields(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert numeric listing fields to float64 in one pass per column"""
+        for column in NUMERIC_FIELDS:
+            try:
+                df[column] = df[column].astype(np.float64)
+            except (ValueError, TypeError):
+                # Only a column holding non-numeric values pays for coercion
+                df[column] = pd.to_numeric(df[column], errors="coerce")
+
+        return df
+
+    def _finalize_dataframe(self, year: int, properties: List[Dict]) -> pd.DataFrame:
+        """Build the structured DataFrame from accumulated raw listings"""
         try:
-            if not response.listings:
+            if not properties:
                 self.logger.debug("No properties found in response")
                 return pd.DataFrame()
 
-            # Add formatted URL
-            for prop in response.listings:
-                prop["year"] = year
-                prop["url"] = self.format_listing_url(prop)
-
-            # Convert to DataFrame
-            df = pd.DataFrame(response.listings)
-
-            # Standardize column names if needed
-            column_mapping = {
-                "LIST_ID": "id",
-                "STREET_NUMBER": "street_number",
-                "STREET_NAME": "street_name",
-                "STREET_DIR": "street_direction",
-                "STREET_TYPE": "street_type",
-                "CITY": "city",
-                "POSTAL_CODE": "postal_code",
-                "PRICE_RAW": "list_price",
-                "SOLD_PRICE_RAW": "sold_price",
-                "LISTED_DATE": "list_date",
-                "SOLD_DATE": "sold_date",
-                "AREA_SQ_FEET": "square_feet",
-                "MLS_NUM": "mls_number",
-                "TOTAL_BEDROOMS": "bedrooms",
-                "TOTAL_BATHS": "bathrooms",
-                "LATITUDE": "latitude",
-                "LONGITUDE": "longitude",
-                "AGENT_NAME": "agent",
-                "OFFICE_NAME": "office",
-                "LIST_SUBAREA": "neighborhood",
-                "url": "detail_url",
-                "year": "built_year",
-            }
+            # Convert to DataFrame, selecting and ordering the columns up front
+            # so unused listing fields are never materialized
+            df = pd.DataFrame.from_records(properties, columns=list(COLUMN_MAPPING))
+            df = self._convert_numeric_fields(df)
 
-            # Rename columns
-            df = df.rename(columns=column_mapping)
+            # Add formatted URL and the year searched for
+            df["url"] = self._format_listing_urls(df)
+            df["year"] = year
 
-            # Select and order columns
-            columns_to_keep = list(column_mapping.values())
-            df = df[columns_to_keep]
+            # Rename columns in place
+            df.columns = list(COLUMN_MAPPING.values())
 
             # Add metadata
             df["fetch_date"] = datetime.now().strftime("%Y-%m-%d")
@@ -453,20 +729,18 @@ class CalgaryMLXScraper:
             # Add average price per square foot
             df = self._add_avg_ft_price(df)
 
+            df = self._downcast_columns(df)
+
             self.logger.debug(f"Successfully parsed {len(df)} properties")
             return df
 
         except Exception as e:
-            self.logger.error(f"Error parsing property data: {str(e)}")
-            traceback.print_exc(file=sys.stdout)
+            self.logger.error(f"Error parsing property data: {str(e)}", exc_info=True)
             raise
 
     def save_to_csv(self, df: pd.DataFrame, filename: str = DEFAULT_OUTPUT_FILE):
         """Save the processed data to a CSV file"""
         try:
-            # Ensure the data directory exists
-            os.makedirs(DATA_DIR, exist_ok=True)
-
             pathname = os.path.join(DATA_DIR, filename)
 
             df.to_csv(pathname, index=False)
@@ -476,22 +750,52 @@ class CalgaryMLXScraper:
             self.logger.error(f"Error saving data: {str(e)}")
             raise
 
+    def save_to_parquet(self, df: pd.DataFrame, filename: str) -> None:
+        """Save the processed data to a zstd-compressed Parquet file"""
+        try:
+            pathname = os.path.join(DATA_DIR, filename)
+
+            df.to_parquet(pathname, engine="pyarrow", compression="zstd", index=False)
+            self.logger.debug(f"Data saved successfully to {pathname}")
+
+        except Exception as e:
+            self.logger.error(f"Error saving data: {str(e)}")
+            raise
+
+    def save_frames_to_csv(self, frames: Iterable[pd.DataFrame], filename: str) -> None:
+        """Stream DataFrames to one CSV file without concatenating them first"""
+        try:
+            pathname = os.path.join(DATA_DIR, filename)
+
+            frames = iter(frames)
+            first = next(frames, None)
+            if first is None:
+                return
+
+            with open(pathname, "w", newline="") as f:
+                first.to_csv(f, index=False)
+                for df in frames:
+                    df.to_csv(f, header=False, index=False)
+
+            self.logger.debug(f"Data saved successfully to {pathname}")
+
+        except Exception as e:
+            self.logger.error(f"Error saving data: {str(e)}")
+            raise
+
     def format_listing_url(self, property_data: Dict) -> str:
         """Format the listing URL based on property data and config settings"""
         try:
             # Format street components
             street_parts = [
-                str(property_data.get(field, ""))
-                for field in PROPERTY_URL_FIELDS["street_parts"]
+                str(property_data.get(field, "")) for field in STREET_PART_FIELDS
             ]
 
             # Clean and join street parts
-            street_address = "-".join(filter(None, street_parts)).lower()
-            street_address = street_address.replace(" ", "-")
+            street_address = "-".join(filter(None, street_parts)).translate(SLUG_TABLE)
 
             # Format postal code
-            postal_code = str(property_data.get("POSTAL_CODE", "")).lower()
-            postal_code = postal_code.replace(" ", "-")
+            postal_code = str(property_data.get("POSTAL_CODE", "")).translate(SLUG_TABLE)
 
             # Check required fields
             for field in PROPERTY_URL_FIELDS["required_fields"]:
@@ -513,47 +817,70 @@ class CalgaryMLXScraper:
             self.logger.error(f"Error formatting listing URL: {str(e)}")
             return ""
 
-    def _get_area_coordinates(self, area_name: str, area_code: str = "") -> tuple:
+    def _format_listing_urls(self, df: pd.DataFrame) -> pd.Series:
+        """Format the listing URLs of a whole DataFrame of raw listings at once"""
+
+        def text(field: str) -> pd.Series:
+            if field not in df:
+                return pd.Series("", index=df.index)
+            return df[field].fillna("").astype(str)
+
+        # Join the non-empty street components with dashes
+        street_address = pd.Series("", index=df.index)
+        for field in STREET_PART_FIELDS:
+            part = text(field)
+            separator = np.where((street_address != "") & (part != ""), "-", "")
+            street_address = street_address + separator + part
+        street_address = street_address.str.translate(SLUG_TABLE)
+
+        fields = {
+            "prefix": LISTING_URL_PREFIX,
+            "mls_number": text("MLS_NUM").str.lower(),
+            "street_address": street_address,
+            "postal_code": text("POSTAL_CODE").str.translate(SLUG_TABLE),
+            "listing_id": text("LIST_ID"),
+        }
+
+        # Construct URLs by walking the template's literals and fields
+        urls = pd.Series("", index=df.index)
+        for literal, field, _, _ in Formatter().parse(LISTING_URL_TEMPLATE):
+            urls = urls + literal
+            if field:
+                urls = urls + fields[field]
+
+        # Blank out URLs of listings missing a required field
+        complete = pd.Series(True, index=df.index)
+        for field in PROPERTY_URL_FIELDS["required_fields"]:
+            if field not in df:
+                complete[:] = False
+                break
+            complete &= df[field].fillna("").astype(bool)
+
+        missing = len(df) - int(complete.sum())
+        if missing:
+            self.logger.warning(f"Missing required fields for URL in {missing} listings")
+
+        return urls.where(complete, "")
+
+    def _geocode_area(self, area_name: str) -> Optional[Tuple[float, float]]:
         """
-        Get the coordinates for a given area using database cache or geopy
-        Returns a tuple of (latitude, longitude)
+        Look up the coordinates for a given area using geopy
+        Returns a tuple of (latitude, longitude), or None if not found
         """
         try:
-            # Try to get coordinates from database first
-            coords = get_area_coordinates(self.conn, area_name, CITY, PROVINCE, COUNTRY)
-
-            if coords:
-                self.logger.info(
-                    f"Found coordinates for {area_name} in database: ({coords[0]}, {coords[1]})"
-                )
-                return coords
-
-            # If not in database, search online
             search_query = f"{area_name}, {CITY}, {PROVINCE}, {COUNTRY}"
             self.logger.info(f"Getting coordinates for: {search_query}")
 
+            delay = GEOCODER_RETRY_DELAY
             for attempt in range(GEOCODER_MAX_RETRIES):
                 try:
+                    # Stay within the geocoder's usage policy across threads
+                    self.geocoder_rate_limiter.acquire()
                     location = self.geolocator.geocode(search_query)
 
-                    # Sleep after the request
-                    random_sleep()
-
                     if location:
-                        # Save coordinates to database
-                        save_area_coordinates(
-                            self.conn,
-                            area_name,
-                            area_code,
-                            CITY,
-                            PROVINCE,
-                            COUNTRY,
-                            location.latitude,
-                            location.longitude,
-                        )
-
                         self.logger.info(
-                            f"Found and saved coordinates for {area_name}: ({location.latitude}, {location.longitude})"
+                            f"Found coordinates for {area_name}: ({location.latitude}, {location.longitude})"
                         )
                         return (location.latitude, location.longitude)
 
@@ -562,24 +889,32 @@ class CalgaryMLXScraper:
                         search_query = f"{area_name}, {CITY}, {COUNTRY}"
                         continue
 
+                    # An empty result is not a failure, asking again won't help
+                    break
+
                 except (GeocoderTimedOut, GeocoderServiceError) as e:
                     if attempt < GEOCODER_MAX_RETRIES - 1:
+                        # Exponential backoff with decorrelated jitter, so
+                        # concurrent workers don't retry in lockstep
+                        delay = min(
+                            GEOCODER_MAX_BACKOFF,
+                            random.uniform(GEOCODER_RETRY_DELAY, delay * 3),
+                        )
                         self.logger.warning(
-                            f"Attempt {attempt + 1} failed: {str(e)}. Retrying..."
+                            f"Attempt {attempt + 1} failed: {str(e)}. "
+                            f"Retrying in {delay:.1f}s..."
                         )
-                        time.sleep(GEOCODER_RETRY_DELAY)
+                        time.sleep(delay)
                         continue
                     raise
 
             # If we get here, no location was found
             self.logger.error(f"Could not find coordinates for {area_name}")
-            # Return default Calgary coordinates as fallback
-            return (DEFAULT_LATITUDE, DEFAULT_LONGITUDE)
 
         except Exception as e:
             self.logger.error(f"Error getting coordinates for {area_name}: {str(e)}")
-            # Return default Calgary coordinates as fallback
-            return (DEFAULT_LATITUDE, DEFAULT_LONGITUDE)
+
+        return None
 
     def initialize_locations(
         self, subareas: dict = SUBAREAS, communities: dict = COMMUNITIES
@@ -592,30 +927,70 @@ class CalgaryMLXScraper:
 
         create_area_coordinates_table(self.conn)
 
+        # Try to get coordinates from database first, loading them in one query
+        saved = get_all_area_coordinates(self.conn, CITY, PROVINCE, COUNTRY)
+        locations = {}
+        for area_code, area_name in coords.items():
+            locations[area_code] = saved.get(area_name)
+            if locations[area_code]:
+                self.logger.info(
+                    f"Found coordinates for {area_name} in database: {locations[area_code]}"
+                )
+
+        # Geocode the remaining areas in parallel
+        missing = [code for code, location in locations.items() if not location]
+        with ThreadPoolExecutor(max_workers=GEOCODER_MAX_WORKERS) as executor:
+            geocoded = executor.map(
+                self._geocode_area, [coords[code] for code in missing]
+            )
+
+            for area_code, location in zip(missing, geocoded):
+                if location:
+                    # Save coordinates to database
+                    save_area_coordinates(
+                        self.conn,
+                        coords[area_code],
+                        area_code,
+                        CITY,
+                        PROVINCE,
+                        COUNTRY,
+                        location[0],
+                        location[1],
+                    )
+                else:
+                    # Fall back to the default Calgary coordinates
+                    location = (DEFAULT_LATITUDE, DEFAULT_LONGITUDE)
+                locations[area_code] = location
+
         area_coords = {}
         for area_code, area_name in coords.items():
-            location_data = self._get_area_coordinates(area_name)
+            location_data = locations[area_code]
             area_coords[area_code] = {
                 "name": area_name,
                 "type": area_type,
                 "latitude": location_data[0],
                 "longitude": location_data[1],
+                "omni": self.api.format_omni(area_code, area_name, area_type),
             }
 
         return area_coords
 
     def save_to_database(self, table_name, df: pd.DataFrame) -> None:
-        """Save the DataFrame to the SQLite database, updating existing records."""
+        """Save the DataFrame to the SQLite database, keeping existing records."""
         try:
-            for i in range(len(df)):
-                try:
-                    df.iloc[i : i + 1].to_sql(
-                        table_name, self.conn, if_exists="append", index=False
-                    )
-                except Exception:
-                    pass  # or any other action
+            if df.empty:
+                return
+
+            # sqlite3 only binds plain Python values, with None for missing ones
+            values = df.astype(object).where(df.notna(), None)
+            saved = insert_properties(
+                self.conn,
+                table_name,
+                list(df.columns),
+                values.itertuples(index=False, name=None),
+            )
 
-            self.logger.debug(f"Saved {len(df)} records into database")
+            self.logger.debug(f"Saved {saved} of {len(df)} records into database")
         except Exception as e:
             self.logger.error(f"Error saving data to database: {str(e)}")
 
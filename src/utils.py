@@ -3,21 +3,37 @@
 import os
 import json
 import logging
+import logging.handlers
+import atexit
+import queue
 from datetime import datetime
 from typing import Dict, Any
 import time
 import random
+import math
 import select
 import sys
+import threading
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library decoder
+    orjson = None
 
 
 def setup_logging(log_file: str) -> logging.Logger:
     """Configure and return a logger instance"""
+    # Create logger
+    logger = logging.getLogger(__name__)
+
+    # Reuse the handlers attached by an earlier scraper instance, adding them
+    # again would repeat every log line
+    if logger.handlers:
+        return logger
+
     # Ensure log directory exists
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
-    # Create logger
-    logger = logging.getLogger(__name__)
     logger.setLevel(logging.DEBUG)
 
     # Create formatters
@@ -41,8 +57,17 @@ def setup_logging(log_file: str) -> logging.Logger:
 
     console_handler.addFilter(WarningInfoFilter())
 
+    # Write the log file from a listener thread, so worker threads only
+    # enqueue their records instead of waiting on file I/O
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     # Add handlers to logger
-    logger.addHandler(file_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     logger.addHandler(console_handler)
 
     return logger
@@ -71,8 +96,25 @@ def format_property_data(raw_item: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def loads_json(content: bytes) -> Any:
+    """Decode a JSON response body, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dumps_json_key(data: Dict[str, Any]) -> bytes:
+    """Serialize a dictionary deterministically, for use as a cache key"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(data, sort_keys=True, default=str).encode()
+
+
 def repr_dict(data: Dict[str, Any], indent: int = 2) -> str:
     """Return a JSON representation of a dictionary with proper formatting"""
+    if orjson is not None and indent == 2:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(data, option=option, default=str).decode()
     return json.dumps(data, ensure_ascii=False, indent=indent, sort_keys=True)
 
 
@@ -82,25 +124,66 @@ def random_sleep(base_ms: int = 300, variance_ms: int = 100) -> None:
     time.sleep(sleep_time)
 
 
+class RateLimiter:
+    """Thread-safe token bucket spacing requests across worker threads"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller may send its next request"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+
+            # Reserve a token, letting the bucket go negative so concurrent
+            # callers queue up behind each other instead of all waking at once
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            self.tokens -= 1
+
+        if wait > 0:
+            time.sleep(wait)
+
+
 def getch(timeout: int = -1, isPrompt: bool = True) -> None:
     if isPrompt:
         print("Please press return key to continue")
 
     INTERVAL = 1
 
+    if timeout > 0 and not isPrompt:
+        # Without a countdown to redraw, a single wait covers the whole timeout
+        inputFlag, _, _ = select.select([sys.stdin], [], [], timeout)
+        if inputFlag:
+            return sys.stdin.read(1), False
+        return None, True
+
     if timeout > 0:
-        while timeout > 0:
+        # Count down against a fixed deadline so time spent redrawing doesn't
+        # stretch the overall wait
+        deadline = time.monotonic() + timeout
+        remaining = float(timeout)
+        while remaining > 0:
 
             if isPrompt:
-                mins, secs = divmod(timeout, 60)
+                mins, secs = divmod(math.ceil(remaining), 60)
                 timer = "{:02d}:{:02d}".format(mins, secs)
                 print("\033[91m{}\033[00m".format(timer), end="\r")
 
-            inputFlag, _, _ = select.select([sys.stdin], [], [], INTERVAL)
+            # Wake on the next whole second so the timer ticks evenly
+            wait = remaining - math.ceil(remaining) + INTERVAL
+            inputFlag, _, _ = select.select([sys.stdin], [], [], wait)
             if inputFlag:
                 return sys.stdin.read(1), False
 
-            timeout -= INTERVAL
+            remaining = deadline - time.monotonic()
         else:
             return None, True
 
@@ -1,9 +1,54 @@
 """Unit tests for the Calgary MLX scraper"""
 
+import logging
+import os
+import sqlite3
+import tempfile
+import time
 import unittest
 from datetime import datetime
+from unittest import mock
+
+import pandas as pd
+import requests
+
+from src.api import APIError, MLXAPI, MLXAPIResponse
+from src.config import (
+    HEADERS,
+    MIN_PRICE_STEP,
+    PROPERTIES_TYPES,
+    SEARCH_MAX_RETRIES,
+    WRITE_QUEUE_SIZE,
+)
+from src.database import create_property_table, insert_properties
+from src.debug_utils import DebugHelper
+from src.response_cache import ResponseCache
 from src.scraper import CalgaryMLXScraper
-from src.utils import validate_price_range
+from src.utils import RateLimiter, validate_price_range
+
+# Listing shared by both sample response types
+SAMPLE_LISTING = {
+    "LIST_ID": 17186820219,
+    "STREET_NUMBER": "101",
+    "STREET_NAME": "Arbour Crest",
+    "STREET_DIR": "NW",
+    "STREET_TYPE": "ROAD",
+    "CITY": "Calgary",
+    "POSTAL_CODE": "T3G 4L4",
+    "PRICE_RAW": 699900,
+    "SOLD_PRICE_RAW": 712000,
+    "LISTED_DATE": 20221214,
+    "SOLD_DATE": 20221216,
+    "AREA_SQ_FEET": 2003,
+    "MLS_NUM": "A2015397",
+    "TOTAL_BEDROOMS": "5",
+    "TOTAL_BATHS": "4",
+    "LATITUDE": 51.13571976,
+    "LONGITUDE": -114.20541145,
+    "AGENT_NAME": "Test Agent",
+    "OFFICE_NAME": "Test Office",
+    "LIST_SUBAREA": "Arbour Lake"
+}
 
 class TestCalgaryMLXScraper(unittest.TestCase):
     def setUp(self):
@@ -11,56 +56,10 @@ class TestCalgaryMLXScraper(unittest.TestCase):
         
         # Sample response data for testing
         self.sample_response_type1 = {
-            "listings": {
-                "17186820219": {
-                    "LIST_ID": 17186820219,
-                    "STREET_NUMBER": "101",
-                    "STREET_NAME": "Arbour Crest",
-                    "STREET_DIR": "NW",
-                    "STREET_TYPE": "ROAD",
-                    "CITY": "Calgary",
-                    "POSTAL_CODE": "T3G 4L4",
-                    "PRICE_RAW": 699900,
-                    "SOLD_PRICE_RAW": 712000,
-                    "LISTED_DATE": 20221214,
-                    "SOLD_DATE": 20221216,
-                    "AREA_SQ_FEET": 2003,
-                    "MLS_NUM": "A2015397",
-                    "TOTAL_BEDROOMS": "5",
-                    "TOTAL_BATHS": "4",
-                    "LATITUDE": 51.13571976,
-                    "LONGITUDE": -114.20541145,
-                    "AGENT_NAME": "Test Agent",
-                    "OFFICE_NAME": "Test Office",
-                    "LIST_SUBAREA": "Arbour Lake"
-                }
-            }
+            "listings": {"17186820219": SAMPLE_LISTING}
         }
         
-        self.sample_response_type2 = {
-            "results": [{
-                "LIST_ID": 17186820219,
-                "STREET_NUMBER": "101",
-                "STREET_NAME": "Arbour Crest",
-                "STREET_DIR": "NW",
-                "STREET_TYPE": "ROAD",
-                "CITY": "Calgary",
-                "POSTAL_CODE": "T3G 4L4",
-                "PRICE_RAW": 699900,
-                "SOLD_PRICE_RAW": 712000,
-                "LISTED_DATE": 20221214,
-                "SOLD_DATE": 20221216,
-                "AREA_SQ_FEET": 2003,
-                "MLS_NUM": "A2015397",
-                "TOTAL_BEDROOMS": "5",
-                "TOTAL_BATHS": "4",
-                "LATITUDE": 51.13571976,
-                "LONGITUDE": -114.20541145,
-                "AGENT_NAME": "Test Agent",
-                "OFFICE_NAME": "Test Office",
-                "LIST_SUBAREA": "Arbour Lake"
-            }]
-        }
+        self.sample_response_type2 = {"results": [SAMPLE_LISTING]}
 
     def test_parse_property_data_type1(self):
         """Test parsing of Type 1 response (listings dictionary)"""
@@ -102,5 +101,541 @@ class TestCalgaryMLXScraper(unittest.TestCase):
         self.assertIn('sw_lng', boundary)
         self.assertIn('ne_lng', boundary)
 
+
+class CappedSearchAPI:
+    """Fake search API returning at most `cap` listings per price range"""
+
+    def __init__(self, prices, cap):
+        self.prices = prices
+        self.cap = cap
+        self.searches = []
+
+    def build_search_payload(
+        self, subarea_code, subarea_info, year, dwelling_type,
+        price_from=0, price_to=0, year_to=0,
+    ):
+        return {"price-from": price_from, "price-to": price_to}
+
+    def search(self, payload, tile=None, radius=0.02):
+        price_from, price_to = payload["price-from"], payload["price-to"]
+        self.searches.append((price_from, price_to))
+        ids = [
+            list_id
+            for list_id, price in self.prices.items()
+            if price_from == price_to == 0 or price_from <= price <= price_to
+        ]
+        results = [
+            dict(SAMPLE_LISTING, LIST_ID=list_id, PRICE_RAW=self.prices[list_id])
+            for list_id in ids[: self.cap]
+        ]
+        return MLXAPIResponse({"totalFound": len(ids), "results": results})
+
+
+class TiledSearchAPI:
+    """Fake search API revealing sub-tiles whose listings overlap
+
+    tiles maps a tile id to the listing ids it returns and the
+    (id, count) pairs of the sub-tiles it reveals.
+    """
+
+    def __init__(self, tiles, total_found, failing=(), delay=0.0):
+        self.tiles = tiles
+        self.total_found = total_found
+        self.failing = failing
+        self.delay = delay
+        self.searched = []
+
+    def build_search_payload(self, *args, **kwargs):
+        return {}
+
+    def search(self, payload, tile=None, radius=0.02):
+        tile_id = tile.id if tile else 0
+        self.searched.append(tile_id)
+        if tile_id in self.failing:
+            raise APIError(f"Tile {tile_id} failed")
+        if tile_id:
+            time.sleep(self.delay)
+
+        list_ids, sub_tiles = self.tiles[tile_id]
+        return MLXAPIResponse(
+            {
+                "totalFound": self.total_found,
+                "tiles": [
+                    {"id": sub_id, "lat": 51.0, "lon": -114.0, "count": count}
+                    for sub_id, count in sub_tiles
+                ],
+                "results": [dict(SAMPLE_LISTING, LIST_ID=i) for i in list_ids],
+            }
+        )
+
+
+def make_offline_scraper(api):
+    """Build a scraper around a fake API and an in-memory database"""
+    scraper = CalgaryMLXScraper.__new__(CalgaryMLXScraper)
+    scraper.logger = logging.getLogger("tests")
+    scraper.debug = DebugHelper(False)
+    scraper.api = api
+    scraper.conn = sqlite3.connect(":memory:")
+    for property_type in PROPERTIES_TYPES.values():
+        create_property_table(scraper.conn, property_type["name"])
+    return scraper
+
+
+class TestPriceBisection(unittest.TestCase):
+    subarea_info = {
+        "name": "Arbour Lake",
+        "type": "SUBAREA",
+        "latitude": 51.1,
+        "longitude": -114.2,
+    }
+
+    def fetch_year(self, api):
+        scraper = make_offline_scraper(api)
+        return scraper.fetch_properties_by_year(
+            "C-443",
+            self.subarea_info,
+            2000,
+            "detached-house",
+            PROPERTIES_TYPES["detached-house"],
+        )
+
+    def test_splits_until_every_listing_is_found(self):
+        """Test capped ranges are halved until all listings are retrieved"""
+        prices = {100 + i: 150000 + i * 3000 for i in range(40)}
+        api = CappedSearchAPI(prices, cap=5)
+
+        df = self.fetch_year(api)
+
+        self.assertEqual(sorted(df["id"]), sorted(prices))
+        self.assertTrue(df["id"].is_unique)
+        # 12 capped queries search two tiles each, 13 complete ranges one
+        self.assertEqual(len(api.searches), 37)
+
+        for price_from, price_to in api.searches:
+            if price_from or price_to:
+                self.assertEqual(price_from % MIN_PRICE_STEP, 0)
+                self.assertGreaterEqual(price_to - price_from, MIN_PRICE_STEP)
+
+    def test_stops_at_min_price_step(self):
+        """Test listings sharing one price end the bisection at MIN_PRICE_STEP"""
+        prices = {100 + i: 500000 for i in range(8)}
+        api = CappedSearchAPI(prices, cap=5)
+
+        with self.assertLogs("tests", level="WARNING") as logs:
+            df = self.fetch_year(api)
+
+        self.assertEqual(len(df), 5)
+        self.assertTrue(
+            any("cannot be split below" in line for line in logs.output)
+        )
+        widths = [high - low for low, high in api.searches if low or high]
+        self.assertEqual(min(widths), MIN_PRICE_STEP)
+
+
+class TestListingFrames(unittest.TestCase):
+    def setUp(self):
+        self.scraper = make_offline_scraper(None)
+
+    def test_format_listing_urls(self):
+        """Test vectorized URL formatting matches the per-row formatter"""
+        listings = [SAMPLE_LISTING]
+        urls = self.scraper._format_listing_urls(pd.DataFrame(listings))
+        self.assertEqual(urls.iloc[0], self.scraper.format_listing_url(listings[0]))
+
+        incomplete = dict(listings[0], MLS_NUM="")
+        urls = self.scraper._format_listing_urls(pd.DataFrame([incomplete]))
+        self.assertEqual(urls.iloc[0], "")
+
+    def test_downcast_columns(self):
+        """Test integer and low-cardinality columns are narrowed before saving"""
+        missing_bedrooms = dict(SAMPLE_LISTING, LIST_ID=2, TOTAL_BEDROOMS=None)
+        df = self.scraper._finalize_dataframe(2000, [SAMPLE_LISTING, missing_bedrooms])
+
+        for column in ("list_price", "sold_price", "sold_date", "built_year"):
+            self.assertEqual(df[column].dtype.kind, "i", column)
+            self.assertLess(df[column].dtype.itemsize, 8, column)
+        for column in ("street_direction", "city", "agent", "office"):
+            self.assertIsInstance(df[column].dtype, pd.CategoricalDtype, column)
+
+        # Coordinates keep full precision, a missing value keeps the column
+        # integral instead of turning it into floats
+        self.assertEqual(df["latitude"].dtype, "float64")
+        self.assertEqual(df["latitude"].iloc[0], SAMPLE_LISTING["LATITUDE"])
+        self.assertEqual(df["bedrooms"].dtype, "Int8")
+        self.assertEqual(df["bedrooms"].iloc[0], 5)
+        self.assertTrue(pd.isna(df["bedrooms"].iloc[1]))
+
+        # Fractional values are left as floats
+        half_bath = dict(SAMPLE_LISTING, TOTAL_BATHS="2.5")
+        df = self.scraper._finalize_dataframe(2000, [half_bath])
+        self.assertEqual(df["bathrooms"].iloc[0], 2.5)
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+class TestSearchRetry(unittest.TestCase):
+    def setUp(self):
+        self.api = MLXAPI.__new__(MLXAPI)
+        self.api.search_url = "https://example.com/search"
+        self.api.headers = HEADERS
+        self.api.logger = logging.getLogger("tests")
+        self.api.rate_limiter = mock.Mock()
+        self.api.cancelled = mock.Mock()
+        self.api.cancelled.is_set.return_value = False
+        self.api.session = mock.Mock()
+
+        patcher = mock.patch("src.api.random.random", return_value=0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def backoffs(self):
+        return [c.args[0] for c in self.api.cancelled.wait.call_args_list]
+
+    def test_session_sends_default_headers(self):
+        """Test the cookie request does not inherit the search headers"""
+        session = self.api._create_session()
+        self.addCleanup(session.close)
+        self.assertNotIn("x-requested-with", session.headers)
+
+    def test_retries_with_backoff(self):
+        """Test throttling, timeouts and dropped connections are retried"""
+        self.api.session.post.side_effect = [
+            make_response(429, {"Retry-After": "7"}),
+            requests.Timeout(),
+            requests.ConnectionError(),
+            make_response(503),
+            make_response(200),
+        ]
+
+        response = self.api._post_with_retry({})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.backoffs(), [7, 2, 4, 8])
+        # Only the search itself carries the AJAX headers
+        self.assertIs(self.api.session.post.call_args.kwargs["headers"], HEADERS)
+        self.assertEqual(self.api.rate_limiter.acquire.call_count, 5)
+
+    def test_gives_up_after_max_retries(self):
+        """Test the last retryable status is raised once retries run out"""
+        self.api.session.post.return_value = make_response(503)
+
+        with self.assertRaises(requests.HTTPError):
+            self.api._post_with_retry({})
+
+        self.assertEqual(self.api.session.post.call_count, SEARCH_MAX_RETRIES)
+        self.assertEqual(len(self.backoffs()), SEARCH_MAX_RETRIES - 1)
+
+    def test_last_timeout_is_raised(self):
+        """Test a timeout on the final attempt is not swallowed"""
+        self.api.session.post.side_effect = requests.Timeout()
+
+        with self.assertRaises(requests.Timeout):
+            self.api._post_with_retry({})
+
+        self.assertEqual(self.api.session.post.call_count, SEARCH_MAX_RETRIES)
+
+    def test_client_errors_are_not_retried(self):
+        """Test statuses outside SEARCH_RETRY_STATUS_CODES fail immediately"""
+        self.api.session.post.return_value = make_response(404)
+
+        with self.assertRaises(requests.HTTPError):
+            self.api._post_with_retry({})
+
+        self.assertEqual(self.api.session.post.call_count, 1)
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = temp_dir.name
+        self.cache = ResponseCache(self.cache_dir, ttl=60, refresh=False)
+
+    def test_round_trip(self):
+        """Test a stored body is returned for the same payload in any key order"""
+        self.assertIsNone(self.cache.get({"a": 1, "b": 2}))
+
+        self.cache.set({"a": 1, "b": 2}, b'{"totalFound": 1}')
+
+        self.assertEqual(self.cache.get({"b": 2, "a": 1}), b'{"totalFound": 1}')
+        self.assertIsNone(self.cache.get({"a": 1, "b": 3}))
+
+    def test_expired_and_refresh(self):
+        """Test stale entries and refresh mode bypass the cache"""
+        payload = {"a": 1}
+        self.cache.set(payload, b"{}")
+
+        refresh = ResponseCache(self.cache_dir, ttl=60, refresh=True)
+        self.assertIsNone(refresh.get(payload))
+
+        pathname = self.cache._pathname(payload)
+        old = os.path.getmtime(pathname) - 120
+        os.utime(pathname, (old, old))
+        self.assertIsNone(self.cache.get(payload))
+        self.assertFalse(os.path.exists(pathname))
+
+    def test_stale_entries_pruned_on_start(self):
+        """Test entries older than the TTL are deleted when the cache opens"""
+        self.cache.set({"a": 1}, b"stale")
+        self.cache.set({"a": 2}, b"fresh")
+        stale = self.cache._pathname({"a": 1})
+        old = os.path.getmtime(stale) - 120
+        os.utime(stale, (old, old))
+
+        cache = ResponseCache(self.cache_dir, ttl=60, refresh=False)
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertEqual(cache.get({"a": 2}), b"fresh")
+
+    def test_set_replaces_atomically(self):
+        """Test writes go through a temporary file that is renamed into place"""
+        payload = {"a": 1}
+        self.cache.set(payload, b"old")
+        self.cache.set(payload, b"new")
+
+        self.assertEqual(self.cache.get(payload), b"new")
+        # No temporary file is left behind next to the entry
+        filename = os.path.basename(self.cache._pathname(payload))
+        self.assertEqual(os.listdir(self.cache_dir), [filename])
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_spaces_requests(self):
+        """Test callers beyond the burst wait their turn at the given rate"""
+        limiter = RateLimiter(rate=2.0, burst=1)
+
+        with mock.patch("src.utils.time.monotonic", return_value=limiter.updated), \
+                mock.patch("src.utils.time.sleep") as sleep:
+            for _ in range(3):
+                limiter.acquire()
+
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.5, 1.0])
+
+
+class TestInsertProperties(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_property_table(self.conn, "detached_house")
+        self.addCleanup(self.conn.close)
+
+    def test_skips_existing_ids(self):
+        """Test rows whose id is already stored are ignored, not overwritten"""
+        columns = ["id", "street_name"]
+        inserted = insert_properties(
+            self.conn, "detached_house", columns, [(1, "Arbour Crest"), (2, "Bow")]
+        )
+        self.assertEqual(inserted, 2)
+
+        inserted = insert_properties(
+            self.conn, "detached_house", columns, [(2, "Changed"), (3, "Crowchild")]
+        )
+        self.assertEqual(inserted, 1)
+
+        rows = self.conn.execute(
+            "SELECT id, street_name FROM detached_house ORDER BY id"
+        ).fetchall()
+        self.assertEqual(rows, [(1, "Arbour Crest"), (2, "Bow"), (3, "Crowchild")])
+
+
+class TestTileSearch(unittest.TestCase):
+    subarea_info = TestPriceBisection.subarea_info
+
+    # Tile 0 covers the area, tile 1 is centred on the subarea, tile 12
+    # reports no listings and tile 13 is only revealed by tile 1
+    tiles = {
+        0: ([0, 1, 2], [(10, 5), (11, 5), (12, 0)]),
+        1: ([2, 3, 4], [(10, 5), (13, 4)]),
+        10: ([3, 4, 5, 6], []),
+        11: ([6, 7, 8], []),
+        13: ([8, 9, 10, 11], []),
+    }
+
+    def fetch(self, api, seen_ids):
+        scraper = make_offline_scraper(api)
+        return scraper.fetch_properties(
+            "C-443",
+            self.subarea_info,
+            2000,
+            "detached-house",
+            PROPERTIES_TYPES["detached-house"],
+            seen_ids=seen_ids,
+        )
+
+    def test_overlapping_tiles(self):
+        """Test revealed tiles are searched once and listings returned once"""
+        api = TiledSearchAPI(self.tiles, total_found=12)
+        seen_ids = set()
+
+        result = self.fetch(api, seen_ids)
+
+        self.assertTrue(result["found_all"])
+        self.assertEqual(result["count"], 12)
+        self.assertEqual(sorted(result["df"]["id"]), list(range(12)))
+        self.assertEqual(seen_ids, set(range(12)))
+        self.assertEqual(sorted(api.searched), [0, 1, 10, 11, 13])
+
+    def test_seen_ids_are_counted_not_returned(self):
+        """Test listings seen by an earlier query count but are not parsed"""
+        api = TiledSearchAPI(self.tiles, total_found=12)
+        seen_ids = {0, 5}
+
+        result = self.fetch(api, seen_ids)
+
+        self.assertTrue(result["found_all"])
+        self.assertEqual(result["count"], 12)
+        self.assertEqual(sorted(result["df"]["id"]), sorted(set(range(12)) - {0, 5}))
+        self.assertEqual(seen_ids, set(range(12)))
+
+    def test_failing_tile_cancels_queued_tiles(self):
+        """Test a failed tile cancels queued searches and leaves seen ids alone"""
+        queued = list(range(21, 31))
+        tiles = {0: ([0, 1], [(20, 9)] + [(i, 1) for i in queued]), 1: ([], [])}
+        tiles.update({i: ([i], []) for i in queued})
+        api = TiledSearchAPI(tiles, total_found=100, failing={20}, delay=0.05)
+        seen_ids = {99}
+
+        with mock.patch("src.scraper.MAX_WORKERS", 1), self.assertLogs(
+            "tests", level="WARNING"
+        ) as logs:
+            result = self.fetch(api, seen_ids)
+
+        self.assertFalse(result["found_all"])
+        self.assertEqual(result["count"], 0)
+        self.assertEqual(seen_ids, {99})
+        self.assertTrue(any("Search failed" in line for line in logs.output))
+
+        # The busiest tile fails first, at most the tile the worker picked up
+        # before the cancel ran is still searched
+        self.assertEqual(api.searched[:2], [0, 20])
+        self.assertLessEqual(len(api.searched), 3)
+
+
+class YearCountAPI:
+    """Fake search API counting listings built within a range of years"""
+
+    def __init__(self, built_years, failing_from=()):
+        self.built_years = built_years
+        self.failing_from = failing_from
+        self.searched = []
+
+    def build_search_payload(
+        self, subarea_code, subarea_info, year, dwelling_type, year_to=0, **kwargs
+    ):
+        return {"year_from": year, "year_to": year_to or year}
+
+    def search(self, payload, tile=None, radius=0.02):
+        year_from, year_to = payload["year_from"], payload["year_to"]
+        self.searched.append((year_from, year_to))
+        if year_from in self.failing_from:
+            raise APIError(f"Years {year_from}-{year_to} failed")
+        count = sum(year_from <= year <= year_to for year in self.built_years)
+        return MLXAPIResponse({"totalFound": count})
+
+
+class TestYearsToFetch(unittest.TestCase):
+    def years(self, api, start_year, end_year):
+        scraper = make_offline_scraper(api)
+        scraper.start_year, scraper.end_year = start_year, end_year
+        with mock.patch("src.scraper.YEAR_CHUNK_SIZE", 5):
+            return list(
+                scraper._years_to_fetch(
+                    "C-443",
+                    TestPriceBisection.subarea_info,
+                    PROPERTIES_TYPES["detached-house"],
+                )
+            )
+
+    def test_skips_empty_chunks(self):
+        """Test chunks of years without properties are skipped with one search"""
+        api = YearCountAPI({2003, 2011})
+
+        years = self.years(api, 2000, 2012)
+
+        self.assertEqual(years, [2000, 2001, 2002, 2003, 2004, 2010, 2011, 2012])
+        self.assertEqual(api.searched, [(2000, 2004), (2005, 2009), (2010, 2012)])
+
+    def test_single_year_chunk_is_not_counted(self):
+        """Test a chunk of one year is fetched without a range search"""
+        api = YearCountAPI(set())
+
+        self.assertEqual(self.years(api, 2000, 2005), [2005])
+        self.assertEqual(api.searched, [(2000, 2004)])
+
+    def test_failed_count_keeps_chunk(self):
+        """Test a chunk whose count search fails is still fetched"""
+        api = YearCountAPI(set(), failing_from={2000})
+
+        with self.assertLogs("tests", level="WARNING"):
+            years = self.years(api, 2000, 2009)
+
+        self.assertEqual(years, [2000, 2001, 2002, 2003, 2004])
+
+
+class TestOutputWriter(unittest.TestCase):
+    subarea_info = TestPriceBisection.subarea_info
+
+    def setUp(self):
+        self.scraper = make_offline_scraper(CappedSearchAPI({1: 500000}, cap=5))
+        self.scraper.start_year = 2000
+        self.scraper.end_year = 2000 + 2 * WRITE_QUEUE_SIZE
+
+        # One listing per year, so every year is queued for the writer
+        patcher = mock.patch.object(
+            self.scraper,
+            "fetch_properties_by_year",
+            side_effect=lambda code, info, year, *args: pd.DataFrame({"id": [year]}),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch_location(self):
+        self.scraper._fetch_location_with_type(
+            "C-443",
+            self.subarea_info,
+            "detached-house",
+            PROPERTIES_TYPES["detached-house"],
+        )
+
+    def test_years_share_one_number_format(self):
+        """Test a year with a missing value writes whole numbers like the others"""
+        listings = {
+            2000: [SAMPLE_LISTING],
+            2001: [
+                dict(SAMPLE_LISTING, LIST_ID=2),
+                dict(SAMPLE_LISTING, LIST_ID=3, TOTAL_BEDROOMS=None),
+            ],
+        }
+        self.scraper.end_year = 2001
+        self.scraper.fetch_properties_by_year.side_effect = (
+            lambda code, info, year, *args: self.scraper._finalize_dataframe(
+                year, listings[year]
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            with mock.patch("src.scraper.DATA_DIR", data_dir):
+                self.fetch_location()
+            (filename,) = os.listdir(data_dir)
+            with open(os.path.join(data_dir, filename)) as f:
+                df = pd.read_csv(f, dtype=str, keep_default_na=False)
+
+        self.assertEqual(list(df["bedrooms"]), ["5", "5", ""])
+        self.assertEqual(list(df["sold_price"]), ["712000"] * 3)
+
+    def test_write_failure_is_reported(self):
+        """Test a failed write drains the queue and warns on the console"""
+        with mock.patch.object(
+            self.scraper, "save_frames_to_csv", side_effect=OSError("disk full")
+        ), self.assertLogs("tests", level="WARNING") as logs:
+            self.fetch_location()
+
+        self.assertTrue(any("Could not write" in line for line in logs.output))
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file